@@ -1,9 +1,10 @@
-# Flask server for WanderLens
+# Quart server for WanderLens
 # Provides backend APIs for landmark recognition and nearby place discovery
 # Uses OpenStreetMap for location data
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from quart import Quart, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
 
 
 try:
@@ -12,27 +13,293 @@ try:
 except Exception:
     pass
 
-import requests
-from google.cloud import vision
-from dotenv import load_dotenv
+import asyncio
+import hashlib
+import heapq
+import httpx
 import base64
+import diskcache
+import gzip
 import os
-import requests
-import json
 import math
+import numpy as np
+import orjson
+from collections import OrderedDict
+from operator import itemgetter
+from cachetools import TTLCache
 
-load_dotenv()
+try:
+    import brotli  # optional, preferred over gzip when the client accepts it
+except ImportError:
+    brotli = None
 
-# Initialize Flask app with CORS support
-app = Flask(__name__)
+# Initialize Quart app with CORS support
+app = Quart(__name__)
 # Development: allow all origins so the frontend (served from any local dev server)
 # can call the API without CORS issues. Remove or restrict this in production.
-CORS(app)
+app = cors(app, allow_origin="*")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serves jsonify and request.get_json with orjson instead of the stdlib json module"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # _prepare_response_obj is private to Quart; keep quart pinned in requirements.txt
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+
+app.json = OrjsonProvider(app)
+
+# Compress JSON responses (brotli if available, else gzip) for clients that
+# accept it; bodies under COMPRESS_MIN_SIZE bytes are sent as-is.
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+app.config["COMPRESS_LEVEL"] = 6
+
+
+@app.after_request
+async def compress_response(response):
+    if response.mimetype not in app.config["COMPRESS_MIMETYPES"] or "Content-Encoding" in response.headers:
+        return response
+    accept_encoding = request.headers.get("Accept-Encoding", "").lower()
+    if brotli and "br" in accept_encoding:
+        encoding = "br"
+    elif "gzip" in accept_encoding:
+        encoding = "gzip"
+    else:
+        return response
+    data = await response.get_data()
+    if len(data) < app.config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    if encoding == "br":
+        response.set_data(brotli.compress(data, quality=app.config["COMPRESS_LEVEL"]))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=app.config["COMPRESS_LEVEL"]))
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
 
 VISION_API_KEY = os.environ.get("VISION_API_KEY")
 if not VISION_API_KEY:
     print("Warning: No VISION_API_KEY found in environment! Please set it.")
 
+# Single key used for both Vision OCR and Translate, read once at startup
+GOOGLE_API_KEY = (
+    os.getenv("GOOGLE_TRANSLATE_API_KEY")
+    or os.getenv("GOOGLE_CLOUD_API_KEY")
+    or ""
+)
+TRANSLATE_URL = f"https://translation.googleapis.com/language/translate/v2?key={GOOGLE_API_KEY}"
+
+# Shared async HTTP client for Vision, Translate and Overpass calls.
+# Created once the event loop is running so every handler multiplexes
+# its upstream requests over the same connection pool.
+http_client: httpx.AsyncClient = None
+
+# Keep-alive pool sized for bursts of concurrent upstream calls; the
+# transport retries failed connection attempts (not responses) twice.
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_RETRIES = 2
+
+# Connect fast-fails so a dead host doesn't hold a request for the full read
+# timeout; reads get 30 s (Overpass runs up to its 25 s query timeout) or
+# 20 s for Translate.
+HTTP_TIMEOUT = httpx.Timeout(30, connect=3.05)
+TRANSLATE_TIMEOUT = httpx.Timeout(20, connect=3.05)
+
+# Overpass asks clients to identify themselves
+OVERPASS_HEADERS = {"User-Agent": "WanderLens/1.0 (nearby attractions and food lookup)"}
+
+# images:annotate accepts up to 16 images per call; requests arriving within
+# the batch window are coalesced into one upstream POST.
+VISION_BATCH_SIZE = 16
+VISION_BATCH_WINDOW = 0.02  # seconds
+# Vision rejects JSON requests over 10 MB; batches stop short of that,
+# leaving room for the JSON around the base64 images
+VISION_BATCH_MAX_BYTES = 8 * 1024 * 1024
+
+
+class VisionBatcher:
+    """
+    Coalesces concurrent Vision requests for a single feature type into
+    batched images:annotate calls.
+
+    submit() queues one base64 image and resolves to that image's entry
+    from the batch's "responses" list. A 4xx (other than 401/403/429) for a
+    multi-image batch is retried one image at a time, so a bad upload only
+    fails its own submit(); any other HTTP failure is raised from every
+    submit() in it.
+    """
+
+    def __init__(self, feature: dict, api_key: str):
+        self.feature = feature
+        self.url = "https://vision.googleapis.com/v1/images:annotate"
+        # Key goes in a header so it never shows up in error messages that
+        # quote the request URL
+        self.headers = {"X-Goog-Api-Key": api_key or ""}
+        self._queue = asyncio.Queue()
+        self._task = None
+        # asyncio only keeps weak references to tasks, so in-flight
+        # dispatches are held here until they finish
+        self._dispatches = set()
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        # Let batches already sent finish, then fail anything still queued
+        await asyncio.gather(*self._dispatches, return_exceptions=True)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+    async def submit(self, content_b64: str) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((content_b64, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        carry = None
+        try:
+            while True:
+                batch = [carry or await self._queue.get()]
+                carry = None
+                size = len(batch[0][0])
+                deadline = loop.time() + VISION_BATCH_WINDOW
+                while len(batch) < VISION_BATCH_SIZE:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    # An image that would push the body past the size limit
+                    # starts the next batch instead
+                    if size + len(item[0]) > VISION_BATCH_MAX_BYTES:
+                        carry = item
+                        break
+                    batch.append(item)
+                    size += len(item[0])
+                # Dispatch without blocking collection of the next batch
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatches.add(task)
+                task.add_done_callback(self._dispatches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Fail the submits collected for a batch that will never be sent
+            for _, future in batch + ([carry] if carry else []):
+                future.cancel()
+            raise
+
+    async def _dispatch(self, batch: list):
+        payload = {
+            "requests": [
+                {"image": {"content": content_b64}, "features": [self.feature]}
+                for content_b64, _ in batch
+            ]
+        }
+        try:
+            r = await http_client.post(self.url, json=payload, headers=self.headers)
+            r.raise_for_status()
+            responses = orjson.loads(r.content).get("responses", [])
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if len(batch) > 1 and 400 <= status < 500 and status not in (401, 403, 429):
+                # Vision rejects the whole call for one bad image; retry each
+                # image alone so the others still get their results. Auth,
+                # quota and rate-limit failures would fail every retry too
+                await asyncio.gather(*(self._dispatch([item]) for item in batch))
+            else:
+                self._fail(batch, e)
+            return
+        except Exception as e:
+            self._fail(batch, e)
+            return
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result(responses[i] if i < len(responses) else {})
+
+    @staticmethod
+    def _fail(batch: list, exc: Exception):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+
+landmark_batcher: VisionBatcher = None
+text_batcher: VisionBatcher = None
+
+
+@app.before_serving
+async def _open_http_client():
+    global http_client, landmark_batcher, text_batcher
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_RETRIES)
+    http_client = httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT)
+    landmark_batcher = VisionBatcher({"type": "LANDMARK_DETECTION", "maxResults": 5}, VISION_API_KEY)
+    text_batcher = VisionBatcher({"type": "TEXT_DETECTION"}, GOOGLE_API_KEY)
+    landmark_batcher.start()
+    text_batcher.start()
+
+
+@app.after_serving
+async def _close_http_client():
+    await landmark_batcher.stop()
+    await text_batcher.stop()
+    await http_client.aclose()
+
+
+# Content-addressed cache for Vision and Translate results: identical photos
+# and sign text skip the upstream call. An in-process LRU sits in front of an
+# on-disk cache (diskcache) that survives restarts and is shared
+# between worker processes.
+RESULT_CACHE_SIZE = 4096
+RESULT_CACHE_TTL = 86400 * 30  # seconds, disk layer only
+_result_cache = OrderedDict()
+_inflight_results = {}
+_disk_cache = diskcache.Cache(os.getenv("RESULT_CACHE_DIR", ".result_cache"))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# The disk layer does blocking file I/O, so it runs in a worker thread
+async def _cache_get(key: str):
+    if key in _result_cache:
+        _result_cache.move_to_end(key)
+        return _result_cache[key]
+    value = await asyncio.to_thread(_disk_cache.get, key)
+    if value is not None:
+        _remember(key, value)
+    return value
+
+
+async def _cache_set(key: str, value) -> None:
+    _remember(key, value)
+    await asyncio.to_thread(_disk_cache.set, key, value, expire=RESULT_CACHE_TTL)
+
+
+def _remember(key: str, value) -> None:
+    _result_cache[key] = value
+    _result_cache.move_to_end(key)
+    if len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
 def _extract_base64_from_data_url(data_url: str) -> str:
     if not data_url:
         return ""
@@ -41,66 +308,80 @@ def _extract_base64_from_data_url(data_url: str) -> str:
     return data_url
 
 
-def _google_api_key() -> str:
-    # Single key used for both Vision OCR and Translate
-    return (
-        os.getenv("GOOGLE_TRANSLATE_API_KEY")
-        or os.getenv("GOOGLE_CLOUD_API_KEY")
-        or ""
-    )
-
-
-def _compute_box_area(vertices: list) -> float:
-    if not vertices:
-        return 0.0
-    xs = [v.get("x", 0) for v in vertices]
-    ys = [v.get("y", 0) for v in vertices]
-    width = max(xs) - min(xs)
-    height = max(ys) - min(ys)
-    return max(width, 0) * max(height, 0)
-
-
-def _collect_image_dims(pages: list) -> tuple:
-    max_x = 0
-    max_y = 0
-    for p in pages or []:
-        for b in p.get("blocks", []):
-            verts = (b.get("boundingBox") or {}).get("vertices", [])
-            for v in verts:
-                max_x = max(max_x, v.get("x", 0))
-                max_y = max(max_y, v.get("y", 0))
-    return (max_x or 1, max_y or 1)
+def _validated_base64(content_b64: str) -> str:
+    # Drop whitespace (e.g. MIME line breaks), which non-strict decoders accept,
+    # then raise ValueError unless the rest is valid base64
+    content_b64 = "".join(content_b64.split())
+    base64.b64decode(content_b64, validate=True)
+    return content_b64
+
+
+def _box_bounds(vertices: list) -> tuple:
+    # (min_x, min_y, max_x, max_y) in a single pass; missing coordinates are 0
+    it = iter(vertices)
+    first = next(it, None)
+    if first is None:
+        return None
+    min_x = max_x = first.get("x", 0)
+    min_y = max_y = first.get("y", 0)
+    for v in it:
+        x = v.get("x", 0)
+        y = v.get("y", 0)
+        if x < min_x:
+            min_x = x
+        elif x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        elif y > max_y:
+            max_y = y
+    return (min_x, min_y, max_x, max_y)
+
+
+def _block_text(block: dict) -> str:
+    # Reconstruct one line per paragraph from words/symbols, streaming generators
+    # straight into join. Vision always sends these keys, so index directly and
+    # only fall back to .get() for malformed blocks
+    try:
+        return "\n".join(filter(None, (
+            " ".join(filter(None, ("".join(s["text"] for s in w["symbols"] if "text" in s) for w in para["words"])))
+            for para in block["paragraphs"]
+        )))
+    except KeyError:
+        return "\n".join(filter(None, (
+            " ".join(filter(None, ("".join(s.get("text", "") for s in w.get("symbols", ())) for w in para.get("words", ()))))
+            for para in block.get("paragraphs", ())
+        )))
 
 
 def _extract_filtered_text(full_text_anno: dict, min_block_area_ratio: float = 0.01, min_confidence: float = 0.6) -> str:
     if not full_text_anno:
         return ""
-    pages = full_text_anno.get("pages", [])
-    img_w, img_h = _collect_image_dims(pages)
-    img_area = float(img_w * img_h) if img_w and img_h else 1.0
+
+    # One walk over the blocks: track the image extent while recording each
+    # block's box area, then filter the recorded blocks against it
+    max_x = 0
+    max_y = 0
+    candidates = []
+    for p in full_text_anno.get("pages", ()):
+        for b in p.get("blocks", ()):
+            bounds = _box_bounds((b.get("boundingBox") or {}).get("vertices", ()))
+            area = 0.0
+            if bounds:
+                x0, y0, x1, y1 = bounds
+                area = (x1 - x0) * (y1 - y0)
+                max_x = max(max_x, x1)
+                max_y = max(max_y, y1)
+            candidates.append((area, b.get("confidence", 1.0), b))
+    img_area = float((max_x or 1) * (max_y or 1))
 
     collected_lines = []
-    for p in pages:
-        for b in p.get("blocks", []):
-            box = (b.get("boundingBox") or {}).get("vertices", [])
-            area = _compute_box_area(box)
-            area_ratio = (area / img_area) if img_area else 0.0
-            conf = b.get("confidence", 1.0)
-            if area_ratio < min_block_area_ratio or conf < min_confidence:
-                continue
-            # Reconstruct text from paragraphs/words/symbols
-            block_lines = []
-            for para in b.get("paragraphs", []):
-                words = []
-                for w in para.get("words", []):
-                    symbols = [s.get("text", "") for s in w.get("symbols", [])]
-                    word = "".join(symbols)
-                    if word:
-                        words.append(word)
-                if words:
-                    block_lines.append(" ".join(words))
-            if block_lines:
-                collected_lines.append("\n".join(block_lines))
+    for area, conf, b in candidates:
+        if area / img_area < min_block_area_ratio or conf < min_confidence:
+            continue
+        block_text = _block_text(b)
+        if block_text:
+            collected_lines.append(block_text)
 
     # Fallback: if filtering removed everything, return the raw full text
     if not collected_lines:
@@ -108,60 +389,388 @@ def _extract_filtered_text(full_text_anno: dict, min_block_area_ratio: float = 0
     return "\n\n".join(collected_lines)
 
 
-def call_google_vision_text_detection(image_data_url: str) -> str:
-    api_key = _google_api_key()
-    if not api_key:
+async def _single_flight(key: str, fetch):
+    """
+    Awaits fetch() once per key while a call is in flight, so concurrent
+    identical requests (e.g. a double-tapped photo) share one upstream call.
+    """
+    task = _inflight_results.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _inflight_results[key] = task
+        task.add_done_callback(lambda _: _inflight_results.pop(key, None))
+    return await asyncio.shield(task)
+
+
+async def call_google_vision_text_detection(image_data_url: str) -> str:
+    if not GOOGLE_API_KEY:
         return ""  # no key → signal caller to mock
-    url = f"https://vision.googleapis.com/v1/images:annotate?key={api_key}"
-    content_b64 = _extract_base64_from_data_url(image_data_url)
-    payload = {
-        "requests": [
-            {
-                "image": {"content": content_b64},
-                "features": [{"type": "TEXT_DETECTION"}],
-            }
-        ]
-    }
-    r = requests.post(url, json=payload, timeout=20)
-    r.raise_for_status()
-    data = r.json()
+    # Invalid base64 raises here rather than failing the shared Vision batch
+    content_b64 = _validated_base64(_extract_base64_from_data_url(image_data_url))
+    cache_key = "ocr:" + _sha256(content_b64)
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    return await _single_flight(cache_key, lambda: _detect_text(content_b64, cache_key))
+
+
+async def _detect_text(content_b64: str, cache_key: str) -> str:
+    resp0 = await text_batcher.submit(content_b64)
+    if resp0.get("error"):
+        # Per-image Vision error: fall back to demo text without caching it
+        return ""
     try:
-        full = data["responses"][0].get("fullTextAnnotation")
-        return _extract_filtered_text(full, min_block_area_ratio=0.01, min_confidence=0.65)
+        full = resp0.get("fullTextAnnotation")
+        text = _extract_filtered_text(full, min_block_area_ratio=0.01, min_confidence=0.65)
     except Exception:
         try:
-            annotations = data["responses"][0].get("fullTextAnnotation")
-            return annotations.get("text", "") if annotations else ""
+            annotations = resp0.get("fullTextAnnotation")
+            text = annotations.get("text", "") if annotations else ""
         except Exception:
             return ""
+    await _cache_set(cache_key, text)
+    return text
 
 
-def call_google_translate(text: str, target: str = "en") -> dict:
-    api_key = _google_api_key()
-    if not api_key:
+async def call_google_translate(text: str, target: str = "en") -> dict:
+    if not GOOGLE_API_KEY:
         return {"translatedText": "", "detectedSourceLanguage": ""}
-    url = f"https://translation.googleapis.com/language/translate/v2?key={api_key}"
+    cache_key = "tr:" + _sha256(f"{target}|{text}")
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    return await _single_flight(cache_key, lambda: _translate(text, target, cache_key))
+
+
+async def _translate(text: str, target: str, cache_key: str) -> dict:
     payload = {"q": text, "target": target, "format": "text"}
-    r = requests.post(url, data=payload, timeout=20)
+    r = await http_client.post(TRANSLATE_URL, data=payload, timeout=TRANSLATE_TIMEOUT)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
     try:
         tr = data["data"]["translations"][0]
-        return {
+        result = {
             "translatedText": tr.get("translatedText", ""),
             "detectedSourceLanguage": tr.get("detectedSourceLanguage", "")
         }
     except Exception:
         return {"translatedText": "", "detectedSourceLanguage": ""}
+    await _cache_set(cache_key, result)
+    return result
+
+
+# Up to this search radius distances use the equirectangular approximation;
+# beyond it, Haversine. Against Haversine its error at 10 km is under 0.2%
+# (17 m at 80° latitude, 5 m at 60°), below the 0.1 km we report; at 50 km
+# it reaches 0.26% at 60° and 0.88% at 80°.
+EQUIRECTANGULAR_MAX_RADIUS = 10000  # meters
+
+# Search radius bounds in meters; out-of-range values are clamped rather than
+# rejected. Radii between EQUIRECTANGULAR_MAX_RADIUS and MAX_RADIUS take the
+# Haversine path.
+MIN_RADIUS = 1
+MAX_RADIUS = 50000
+
+
+def calculate_distances(lat: float, lon: float, elements: list, radius: int) -> np.ndarray:
+    """Distance in meters from (lat, lon) to each element's lat/lon, vectorized"""
+    R = 6371000  # Earth's radius in meters
+    lats = np.radians(np.fromiter((e['lat'] for e in elements), dtype=np.float64, count=len(elements)))
+    lons = np.radians(np.fromiter((e['lon'] for e in elements), dtype=np.float64, count=len(elements)))
+    lat0 = math.radians(lat)
+    dlat = lats - lat0
+    dlon = lons - math.radians(lon)
+    if radius <= EQUIRECTANGULAR_MAX_RADIUS:
+        # Wrap longitude differences across the antimeridian into [-pi, pi)
+        dlon = (dlon + math.pi) % (2 * math.pi) - math.pi
+        return R * np.hypot(dlat, dlon * math.cos(lat0))
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat0) * np.cos(lats) * np.sin(dlon / 2) ** 2
+    return 2 * R * np.arcsin(np.sqrt(a))
+
+
+# Tags selected by the Overpass query below, used to split its result into
+# attractions and food spots
+ATTRACTION_TOURISM = {"attraction", "museum", "gallery", "zoo", "theme_park", "monument", "memorial", "viewpoint"}
+ATTRACTION_HISTORIC = {"monument", "castle", "palace", "ruins"}
+FOOD_AMENITIES = {"restaurant", "cafe", "bar"}
+SKIP_AMENITIES = frozenset({"fast_food"})
+
+# OSM address tags, in display order
+ADDR_KEYS = ('addr:housenumber', 'addr:street', 'addr:city')
+
+# Priority scoring: museums, galleries, monuments get higher priority
+ATTRACTION_TYPE_PRIORITY = {
+    'museum': 3,
+    'gallery': 3,
+    'monument': 2,
+    'memorial': 2,
+    'attraction': 1,
+    'viewpoint': 1,
+    'artwork': 1
+}
+
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+
+# OpenStreetMap Overpass API query - named tourist attractions and food spots
+# in one union. `out qt` skips the server-side sort by id; `out tags` would
+# drop the node coordinates we need. maxsize caps Overpass' own memory use.
+# Built once at import; only radius/lat/lon are filled in per request.
+NEARBY_QUERY = """\
+[out:json][timeout:25][maxsize:8388608];
+(
+  node["tourism"="attraction"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="museum"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="gallery"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="zoo"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="theme_park"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="monument"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="memorial"]["name"](around:{radius},{lat},{lon});
+  node["tourism"="viewpoint"]["name"](around:{radius},{lat},{lon});
+  node["historic"="monument"]["name"](around:{radius},{lat},{lon});
+  node["historic"="castle"]["name"](around:{radius},{lat},{lon});
+  node["historic"="palace"]["name"](around:{radius},{lat},{lon});
+  node["historic"="ruins"]["name"](around:{radius},{lat},{lon});
+  node["amenity"="restaurant"]["name"](around:{radius},{lat},{lon});
+  node["amenity"="cafe"]["cuisine"!~"coffee_shop"]["name"](around:{radius},{lat},{lon});
+  node["amenity"="bar"]["name"](around:{radius},{lat},{lon});
+);
+out qt;
+""".format
+
+# Nearby queries are cached on a ~100 m grid (coordinates rounded to 3
+# decimals) for 10 minutes. Concurrent misses for the same cell share one
+# in-flight Overpass request.
+# Areas whose response was too large are cached as _TOO_LARGE, so retries
+# get the 413 without downloading the body again. Runtime-error remarks
+# (timeouts, out of memory) are transient and never cached.
+OVERPASS_CACHE = TTLCache(maxsize=1024, ttl=600)
+# A point can be up to ~79 m from its grid point, so the query around the grid
+# point is widened by this much and results are trimmed to the real radius
+OVERPASS_GRID_SLACK = 80  # meters
+_overpass_inflight = {}
+_TOO_LARGE = object()
+
+# Upper bound on an Overpass response body; larger areas are rejected so a
+# dense city centre can't blow up parse time and memory. Sized for the merged
+# query, where food spots usually outnumber attractions many times over, so a
+# dense restaurant district doesn't fail /attractions on its own.
+OVERPASS_MAX_BYTES = 4 * 1024 * 1024
+TOO_LARGE_RESPONSE = {"error": "too_many_places", "message": "Too many places in this area; try a smaller radius"}
+
+
+class OverpassResponseTooLarge(Exception):
+    """
+    Raised when an Overpass response exceeds OVERPASS_MAX_BYTES, or with the
+    remark when the query ran out of memory on the Overpass side
+    """
+
+
+class OverpassError(Exception):
+    """Raised when Overpass answers 200 but without usable results"""
+
+
+def _is_attraction(tags: dict) -> bool:
+    return tags.get("tourism") in ATTRACTION_TOURISM or tags.get("historic") in ATTRACTION_HISTORIC
+
+
+async def fetch_nearby_elements(lat: float, lon: float, radius: int) -> list:
+    """
+    Returns the Overpass elements (with coordinates) for attractions and food
+    spots around a point, served from OVERPASS_CACHE when possible. Elements
+    can lie up to OVERPASS_GRID_SLACK meters beyond the radius.
+    Raises httpx.HTTPError or OverpassError on failure, or OverpassResponseTooLarge.
+    """
+    key = (round(lat, 3), round(lon, 3), radius)
+    elements = OVERPASS_CACHE.get(key)
+    if elements is _TOO_LARGE:
+        raise OverpassResponseTooLarge()
+    if elements is not None:
+        return elements
+
+    task = _overpass_inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_query_nearby_elements(key[0], key[1], radius + OVERPASS_GRID_SLACK))
+        _overpass_inflight[key] = task
+        task.add_done_callback(lambda _: _overpass_inflight.pop(key, None))
+    # Shielded so a disconnecting client doesn't cancel the request for the others
+    try:
+        elements = await asyncio.shield(task)
+    except OverpassResponseTooLarge as e:
+        # An out-of-memory remark (carried as e.args) depends on Overpass load,
+        # so only an oversized body is remembered
+        if not e.args:
+            OVERPASS_CACHE[key] = _TOO_LARGE
+        raise
+    OVERPASS_CACHE[key] = elements
+    return elements
+
+
+async def _query_nearby_elements(lat: float, lon: float, radius: int) -> list:
+    """Queries Overpass once for both attractions and food spots around a point"""
+    query = NEARBY_QUERY(radius=radius, lat=lat, lon=lon)
+
+    # Stream the body so an oversized response is abandoned early
+    async with http_client.stream("POST", OVERPASS_URL, content=query, headers=OVERPASS_HEADERS) as response:
+        response.raise_for_status()
+        if int(response.headers.get("Content-Length", 0)) > OVERPASS_MAX_BYTES:
+            raise OverpassResponseTooLarge()
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body += chunk
+            if len(body) > OVERPASS_MAX_BYTES:
+                raise OverpassResponseTooLarge()
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # e.g. an HTML error page from a proxy in front of Overpass
+        raise OverpassError("Overpass returned a non-JSON response")
+
+    # Overpass reports query failures (out of memory under maxsize, timeouts)
+    # as a 200 with a runtime error remark and partial or no elements
+    remark = data.get('remark') or ''
+    if remark.startswith('runtime error'):
+        if 'out of memory' in remark:
+            raise OverpassResponseTooLarge(remark)
+        raise OverpassError(remark)
+
+    # Skip elements without coordinates (e.g., ways/relations or incomplete data)
+    return [e for e in data.get('elements', []) if e.get('lat') is not None and e.get('lon') is not None]
+
+
+def _is_food_spot(tags: dict) -> bool:
+    # Skip fast food and coffee shops, checked on the raw lowercased tags
+    # before any display formatting
+    amenity = tags.get('amenity')
+    return (amenity in FOOD_AMENITIES and amenity not in SKIP_AMENITIES
+            and 'coffee' not in tags.get('cuisine', '').lower())
+
+
+def _format_address(tags: dict) -> str:
+    address_parts = [tags[k] for k in ADDR_KEYS if tags.get(k)]
+    return ', '.join(address_parts) if address_parts else 'Address not available'
+
+
+def _iter_poi_records(elements: list, lat: float, lon: float, radius: int, accept):
+    """
+    Yields (element, tags, name, distance_km, walking_time) for the named elements
+    within radius that accept(tags) keeps, measuring all of them in one
+    vectorized pass
+    """
+    # Cheap rejects first, so only the POIs we keep get distance work
+    candidates = []
+    for element in elements:
+        tags = element.get('tags', {})
+        # Skip unnamed POIs
+        name = tags.get('name', '').strip()
+        if name and accept(tags):
+            candidates.append((element, tags, name))
+    distances_m = calculate_distances(lat, lon, [c[0] for c in candidates], radius)
+
+    for (element, tags, name), distance_m in zip(candidates, distances_m.tolist()):
+        # Drop the grid slack the Overpass query was widened by
+        if distance_m > radius:
+            continue
+        distance_km = round(distance_m / 1000, 1)
+        walking_time = round(distance_m / 83.33)  # Average walking speed: 5 km/h = 83.33 m/min
+        yield element, tags, name, distance_km, walking_time
+
+
+def top_k_by_priority(ranked: list, k: int = 6) -> list:
+    """Picks the k best records from ((priority, -distance_km), record) pairs"""
+    return [record for _, record in heapq.nlargest(k, ranked, key=itemgetter(0))]
+
+
+def _attraction_type(tags: dict) -> str:
+    return tags.get('tourism', tags.get('historic', tags.get('amenity', 'attraction')))
+
+
+def build_attractions(elements: list, lat: float, lon: float, radius: int) -> dict:
+    """Formats the attraction elements of a nearby query into the /attractions payload"""
+    # Rank on the type alone; address and the other tag lookups are deferred
+    # until the winners are known
+    ranked = []
+    for poi in _iter_poi_records(elements, lat, lon, radius, _is_attraction):
+        tags, distance_km = poi[1], poi[3]
+        # Lower distance = higher priority (multiply by -1)
+        ranked.append(((ATTRACTION_TYPE_PRIORITY.get(_attraction_type(tags), 0), -distance_km), poi))
+
+    attractions = []
+    for element, tags, name, distance_km, walking_time in top_k_by_priority(ranked):  # Limit to 6 attractions max
+        attractions.append({
+            'id': element.get('id'),
+            'name': name,
+            'type': _attraction_type(tags),
+            'lat': element['lat'],
+            'lon': element['lon'],
+            'address': _format_address(tags),
+            'distance_km': distance_km,
+            'walking_time_min': walking_time,
+            'description': tags.get('description', ''),
+            'website': tags.get('website', ''),
+            'opening_hours': tags.get('opening_hours', '')
+        })
+
+    return {
+        'attractions': attractions,
+        'count': len(attractions),
+        'center': {'lat': lat, 'lon': lon},
+        'radius': radius
+    }
+
+
+def build_food_spots(elements: list, lat: float, lon: float, radius: int) -> dict:
+    """Formats the food elements of a nearby query into the /food payload"""
+    # Rank on which tags are present; cuisine formatting, address and
+    # description are deferred until the winners are known
+    ranked = []
+    for poi in _iter_poi_records(elements, lat, lon, radius, _is_food_spot):
+        tags, distance_km = poi[1], poi[3]
+        # Priority scoring: restaurants with cuisine info get higher priority
+        priority = (2 if tags.get('cuisine') else 0) + (1 if tags.get('website') else 0) + (1 if tags.get('opening_hours') else 0)
+        # Lower distance = higher priority (multiply by -1)
+        ranked.append(((priority, -distance_km), poi))
+
+    food_spots = []
+    for element, tags, name, distance_km, walking_time in top_k_by_priority(ranked):  # Limit to 6 food spots max
+        # Get display cuisine type
+        cuisine = tags.get('cuisine', '').replace(';', ', ').title()
+
+        description_parts = []
+        if cuisine:
+            description_parts.append(f"Cuisine: {cuisine}")
+        if tags.get('description'):
+            description_parts.append(tags.get('description'))
+
+        food_spots.append({
+            'id': element.get('id'),
+            'name': name,
+            'type': tags['amenity'].replace('_', ' ').title(),
+            'cuisine': cuisine,
+            'lat': element['lat'],
+            'lon': element['lon'],
+            'address': _format_address(tags),
+            'distance_km': distance_km,
+            'walking_time_min': walking_time,
+            'description': ' | '.join(description_parts) if description_parts else '',
+            'website': tags.get('website', ''),
+            'opening_hours': tags.get('opening_hours', '')
+        })
+
+    return {
+        'food_spots': food_spots,
+        'food_count': len(food_spots),
+        'center': {'lat': lat, 'lon': lon},
+        'radius': radius
+    }
 
 
 @app.route("/health", methods=["GET"])
-def health():
+async def health():
     """Health check endpoint to verify server status"""
     return jsonify({"status": "ok"})
 
 @app.route("/analyze", methods=["POST"])
-def analyze():
+async def analyze():
     """
     Analyzes an image for landmark recognition
     
@@ -180,17 +789,19 @@ def analyze():
         "info": "description or additional information"
     }
     """
-    data = request.get_json(silent=True) or {}
+    data = await request.get_json(silent=True) or {}
     image_data_url = data.get("image", "")
 
     if not image_data_url:
         return jsonify({"error": "No image provided"}), 400
 
     if image_data_url.startswith("data:image"):
-        image_data_url = image_data_url.split(",")[1]
+        image_data_url = image_data_url.split(",", 1)[1]
 
+    # Validate only; Vision takes the base64 string as-is, so the decoded
+    # bytes are not re-encoded
     try:
-        image_bytes = base64.b64decode(image_data_url)
+        image_data_url = _validated_base64(image_data_url)
     except Exception:
         return jsonify({"error": "Invalid base64 image"}), 400
 
@@ -198,55 +809,47 @@ def analyze():
         return jsonify({"error": "missing_api_key", "message": "Set VISION_API_KEY in environment"}), 500
 
     try:
-        b64 = base64.b64encode(image_bytes).decode("utf-8")
-        url = f"https://vision.googleapis.com/v1/images:annotate?key={VISION_API_KEY}"
-        payload = {
-            "requests": [
-                {
-                    "image": {"content": b64},
-                    "features": [{"type": "LANDMARK_DETECTION", "maxResults": 5}]
-                }
-            ]
-        }
-        r = requests.post(url, json=payload, timeout=30)
-        if not r.ok:
-            return jsonify({"error": "vision_api_error", "message": r.text}), 502
+        cache_key = "landmark:" + _sha256(image_data_url)
+        cached = await _cache_get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+        resp0 = await landmark_batcher.submit(image_data_url)
+        if resp0.get("error"):
+            return jsonify({"error": "vision_api_error", "message": resp0["error"].get("message", "")}), 502
 
-        resp_json = r.json()
-        resp0 = resp_json.get("responses", [])[0] if resp_json.get("responses") else {}
         landmarks = resp0.get("landmarkAnnotations", [])
 
         if not landmarks:
-            return jsonify({"landmark": None, "info": "No landmark detected."})
-
-        landmark = landmarks[0]
-        return jsonify({
-            "landmark": landmark.get("description"),
-            "confidence": landmark.get("score"),
-            "info": f"Detected landmark: {landmark.get('description')}"
-        })
+            result = {"landmark": None, "info": "No landmark detected."}
+        else:
+            landmark = landmarks[0]
+            result = {
+                "landmark": landmark.get("description"),
+                "confidence": landmark.get("score"),
+                "info": f"Detected landmark: {landmark.get('description')}"
+            }
+        await _cache_set(cache_key, result)
+        return jsonify(result)
+    except httpx.HTTPStatusError as e:
+        return jsonify({"error": "vision_api_error", "message": e.response.text}), 502
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": "vision_api_error", "message": str(e)}), 502
 
 
-@app.route("/ocr_translate", methods=["POST"])
-def ocr_translate():
-    body = request.get_json(silent=True) or {}
-    image_data_url = body.get("image", "")
-    target_lang = (body.get("target") or "en").lower()
-
+async def ocr_translate_image(image_data_url: str, target_lang: str) -> dict:
+    """Runs OCR then translation for one image, mocking on missing key or failure"""
     detected_text = ""
     translated_text = ""
     source_lang = ""
 
     try:
-        detected_text = call_google_vision_text_detection(image_data_url)
+        detected_text = await call_google_vision_text_detection(image_data_url)
         if not detected_text:
             # No API key or no text: provide a graceful mock for demo continuity
             detected_text = "Demo text on sign"
-        tr = call_google_translate(detected_text, target=target_lang)
+        tr = await call_google_translate(detected_text, target=target_lang)
         translated_text = tr.get("translatedText") or ("Demo translation → " + detected_text)
         source_lang = tr.get("detectedSourceLanguage") or "auto"
     except Exception:
@@ -254,21 +857,46 @@ def ocr_translate():
         translated_text = "Demo translation → Demo text on sign"
         source_lang = "auto"
 
-    return jsonify({
+    return {
         "detected_text": detected_text,
         "translated_text": translated_text,
         "source_lang": source_lang,
         "target_lang": target_lang
-    })
+    }
+
+
+@app.route("/ocr_translate", methods=["POST"])
+async def ocr_translate():
+    """
+    Request body: {"image": data URL, "target": lang} for a single image, or
+    {"images": [data URL, ...], "target": lang} to translate up to
+    VISION_BATCH_SIZE images concurrently; the latter returns
+    {"results": [...]} in input order.
+    """
+    body = await request.get_json(silent=True) or {}
+    target_lang = (body.get("target") or "en").lower()
+
+    images = body.get("images")
+    if isinstance(images, list):
+        if len(images) > VISION_BATCH_SIZE:
+            return jsonify({"error": f"At most {VISION_BATCH_SIZE} images per request"}), 400
+        if not all(isinstance(img, str) for img in images):
+            return jsonify({"error": "images must be a list of data URL strings"}), 400
+        results = await asyncio.gather(*(ocr_translate_image(img, target_lang) for img in images))
+        return jsonify({"results": results})
+
+    return jsonify(await ocr_translate_image(body.get("image", ""), target_lang))
+
+
 @app.route("/attractions", methods=["GET"])
-def get_attractions():
+async def get_attractions():
     """
     Fetches nearby tourist attractions using OpenStreetMap data
     
     Query parameters:
     - lat (float): Latitude of center point
     - lon (float): Longitude of center point
-    - radius (int): Search radius in meters (default: 1000)
+    - radius (int): Search radius in meters (default: 1000, clamped to 1-50000)
     
     Returns:
     - List of attractions with:
@@ -287,245 +915,71 @@ def get_attractions():
     lat = request.args.get('lat', type=float)
     lon = request.args.get('lon', type=float)
     radius = request.args.get('radius', 1000, type=int)  # meters, default 1km
+    radius = max(MIN_RADIUS, min(radius, MAX_RADIUS))
     
-    if not lat or not lon:
+    if lat is None or lon is None:
         return jsonify({"error": "lat and lon parameters required"}), 400
     
-    # OpenStreetMap Overpass API query - refined for better tourist attractions
-    overpass_url = "https://overpass-api.de/api/interpreter"
-    query = f"""
-    [out:json][timeout:25];
-    (
-      node["tourism"="attraction"](around:{radius},{lat},{lon});
-      node["tourism"="museum"](around:{radius},{lat},{lon});
-      node["tourism"="gallery"](around:{radius},{lat},{lon});
-      node["tourism"="zoo"](around:{radius},{lat},{lon});
-      node["tourism"="theme_park"](around:{radius},{lat},{lon});
-      node["tourism"="monument"](around:{radius},{lat},{lon});
-      node["tourism"="memorial"](around:{radius},{lat},{lon});
-      node["tourism"="viewpoint"](around:{radius},{lat},{lon});
-      node["historic"="monument"](around:{radius},{lat},{lon});
-      node["historic"="castle"](around:{radius},{lat},{lon});
-      node["historic"="palace"](around:{radius},{lat},{lon});
-      node["historic"="ruins"](around:{radius},{lat},{lon});
-    );
-    out;
-    """
-    
     try:
-        response = requests.post(overpass_url, data=query)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Process and format the results
-        attractions = []
-        for element in data.get('elements', []):
-            tags = element.get('tags', {})
-            attraction_lat = element.get('lat')
-            attraction_lon = element.get('lon')
-            # Skip elements without coordinates (e.g., ways/relations or incomplete data)
-            if attraction_lat is None or attraction_lon is None:
-                continue
-            
-            # Calculate distance in meters using Haversine formula
-            def calculate_distance(lat1, lon1, lat2, lon2):
-                R = 6371000  # Earth's radius in meters
-                dlat = math.radians(lat2 - lat1)
-                dlon = math.radians(lon2 - lon1)
-                a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-                     math.sin(dlon/2) * math.sin(dlon/2))
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                return R * c
-            
-            distance_m = calculate_distance(lat, lon, attraction_lat, attraction_lon)
-            distance_km = round(distance_m / 1000, 1)
-            walking_time = round(distance_m / 83.33)  # Average walking speed: 5 km/h = 83.33 m/min
-            
-            # Format address
-            address_parts = []
-            if tags.get('addr:housenumber'):
-                address_parts.append(tags.get('addr:housenumber'))
-            if tags.get('addr:street'):
-                address_parts.append(tags.get('addr:street'))
-            if tags.get('addr:city'):
-                address_parts.append(tags.get('addr:city'))
-            address = ', '.join(address_parts) if address_parts else 'Address not available'
-            
-            # Skip unnamed attractions
-            name = tags.get('name', '').strip()
-            if not name:
-                continue
-
-            attractions.append({
-                'id': element.get('id'),
-                'name': name,
-                'type': tags.get('tourism', tags.get('historic', tags.get('amenity', 'attraction'))),
-                'lat': attraction_lat,
-                'lon': attraction_lon,
-                'address': address,
-                'distance_km': distance_km,
-                'walking_time_min': walking_time,
-                'description': tags.get('description', ''),
-                'website': tags.get('website', ''),
-                'opening_hours': tags.get('opening_hours', '')
-            })
-        
-        # Sort by quality and distance, then limit to 6 results
-        def attraction_priority(attraction):
-            # Priority scoring: museums, galleries, monuments get higher priority
-            type_priority = {
-                'museum': 3,
-                'gallery': 3,
-                'monument': 2,
-                'memorial': 2,
-                'attraction': 1,
-                'viewpoint': 1,
-                'artwork': 1
-            }
-            priority = type_priority.get(attraction['type'], 0)
-            # Lower distance = higher priority (multiply by -1)
-            return (priority, -attraction['distance_km'])
-        
-        attractions.sort(key=attraction_priority, reverse=True)
-        attractions = attractions[:6]  # Limit to 6 attractions max
-        
-        return jsonify({
-            'attractions': attractions,
-            'count': len(attractions),
-            'center': {'lat': lat, 'lon': lon},
-            'radius': radius
-        })
-        
-    except requests.RequestException as e:
+        elements = await fetch_nearby_elements(lat, lon, radius)
+        return jsonify(build_attractions(elements, lat, lon, radius))
+    except (httpx.HTTPError, OverpassError) as e:
         return jsonify({"error": f"Failed to fetch attractions: {str(e)}"}), 500
+    except OverpassResponseTooLarge:
+        return jsonify(TOO_LARGE_RESPONSE), 413
 
 
 @app.route("/food", methods=["GET"])
-def get_food_spots():
+async def get_food_spots():
     # Get query parameters
     lat = request.args.get('lat', type=float)
     lon = request.args.get('lon', type=float)
     radius = request.args.get('radius', 1000, type=int)  # meters, default 1km
+    radius = max(MIN_RADIUS, min(radius, MAX_RADIUS))
     
-    if not lat or not lon:
+    if lat is None or lon is None:
         return jsonify({"error": "lat and lon parameters required"}), 400
     
-    # OpenStreetMap Overpass API query for food spots
-    overpass_url = "https://overpass-api.de/api/interpreter"
-    query = f"""
-    [out:json][timeout:25];
-    (
-      node["amenity"="restaurant"](around:{radius},{lat},{lon});
-      node["amenity"="cafe"]["cuisine"!~"coffee_shop"](around:{radius},{lat},{lon});
-      node["amenity"="bar"](around:{radius},{lat},{lon});
-    );
-    out;
-    """
-    
     try:
-        response = requests.post(overpass_url, data=query)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Process and format the results
-        food_spots = []
-        for element in data.get('elements', []):
-            tags = element.get('tags', {})
-            spot_lat = element.get('lat')
-            spot_lon = element.get('lon')
-            # Skip elements without coordinates (e.g., ways/relations or incomplete data)
-            if spot_lat is None or spot_lon is None:
-                continue
-            
-            # Calculate distance in meters using Haversine formula
-            def calculate_distance(lat1, lon1, lat2, lon2):
-                R = 6371000  # Earth's radius in meters
-                dlat = math.radians(lat2 - lat1)
-                dlon = math.radians(lon2 - lon1)
-                a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-                     math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-                     math.sin(dlon/2) * math.sin(dlon/2))
-                c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                return R * c
-            
-            distance_m = calculate_distance(lat, lon, spot_lat, spot_lon)
-            distance_km = round(distance_m / 1000, 1)
-            walking_time = round(distance_m / 83.33)  # Average walking speed: 5 km/h = 83.33 m/min
-            
-            # Format address
-            address_parts = []
-            if tags.get('addr:housenumber'):
-                address_parts.append(tags.get('addr:housenumber'))
-            if tags.get('addr:street'):
-                address_parts.append(tags.get('addr:street'))
-            if tags.get('addr:city'):
-                address_parts.append(tags.get('addr:city'))
-            address = ', '.join(address_parts) if address_parts else 'Address not available'
-
-            # Get cuisine type and amenity
-            cuisine = tags.get('cuisine', '').replace(';', ', ').title()
-            amenity = tags.get('amenity', '').lower()
-            
-            # Skip fast food and coffee shops
-            if amenity in ['fast_food'] or 'coffee' in cuisine.lower():
-                continue
-                
-            name = tags.get('name', '').strip()
-            if not name:
-                continue
-
-            description_parts = []
-            if cuisine:
-                description_parts.append(f"Cuisine: {cuisine}")
-            if tags.get('description'):
-                description_parts.append(tags.get('description'))
-            
-            description = ' | '.join(description_parts) if description_parts else ''
-            
-            food_spots.append({
-                'id': element.get('id'),
-                'name': name,
-                'type': amenity.replace('_', ' ').title(),
-                'cuisine': cuisine,
-                'lat': spot_lat,
-                'lon': spot_lon,
-                'address': address,
-                'distance_km': distance_km,
-                'walking_time_min': walking_time,
-                'description': description,
-                'website': tags.get('website', ''),
-                'opening_hours': tags.get('opening_hours', '')
-            })
-        
-        # Sort by quality and distance, then limit to 6 results
-        def food_priority(food_spot):
-            # Priority scoring: restaurants with cuisine info get higher priority
-            priority = 0
-            if food_spot.get('cuisine'):
-                priority += 2
-            if food_spot.get('website'):
-                priority += 1
-            if food_spot.get('opening_hours'):
-                priority += 1
-            # Lower distance = higher priority (multiply by -1)
-            return (priority, -food_spot['distance_km'])
-        
-        food_spots.sort(key=food_priority, reverse=True)
-        food_spots = food_spots[:6]  # Limit to 6 food spots max
-        
-        return jsonify({
-            'food_spots': food_spots,
-            'food_count': len(food_spots),
-            'center': {'lat': lat, 'lon': lon},
-            'radius': radius
-        })
-        
-    except requests.RequestException as e:
+        elements = await fetch_nearby_elements(lat, lon, radius)
+        return jsonify(build_food_spots(elements, lat, lon, radius))
+    except (httpx.HTTPError, OverpassError) as e:
         return jsonify({"error": f"Failed to fetch food spots: {str(e)}"}), 500
+    except OverpassResponseTooLarge:
+        return jsonify(TOO_LARGE_RESPONSE), 413
+
+
+@app.route("/nearby", methods=["GET"])
+@app.route("/discover", methods=["GET"])
+async def get_nearby():
+    """
+    Fetches attractions and food spots from a single Overpass query.
+    Takes the same lat/lon/radius parameters as /attractions and returns the
+    union of the /attractions and /food responses.
+    """
+    lat = request.args.get('lat', type=float)
+    lon = request.args.get('lon', type=float)
+    radius = request.args.get('radius', 1000, type=int)  # meters, default 1km
+    radius = max(MIN_RADIUS, min(radius, MAX_RADIUS))
+
+    if lat is None or lon is None:
+        return jsonify({"error": "lat and lon parameters required"}), 400
+
+    try:
+        elements = await fetch_nearby_elements(lat, lon, radius)
+    except (httpx.HTTPError, OverpassError) as e:
+        return jsonify({"error": f"Failed to fetch nearby places: {str(e)}"}), 500
+    except OverpassResponseTooLarge:
+        return jsonify(TOO_LARGE_RESPONSE), 413
+
+    return jsonify({
+        **build_attractions(elements, lat, lon, radius),
+        **build_food_spots(elements, lat, lon, radius),
+    })
 
 
 if __name__ == "__main__":
-    app.run(host="127.0.0.1", port=5001, debug=True)
+    # Development server only; set QUART_DEBUG=1 for the reloader and debugger
+    app.run(host="127.0.0.1", port=5001, debug=os.getenv("QUART_DEBUG", "").lower() in {"1", "true"})
 
 
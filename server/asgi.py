@@ -0,0 +1,5 @@
+# ASGI entrypoint for serving WanderLens in production
+# Run from the server/ directory with `gunicorn asgi:app` (settings in gunicorn.conf.py)
+# `python app.py` starts the single-process development server instead
+
+from app import app  # noqa: F401
@@ -0,0 +1,10 @@
+# Gunicorn settings for serving WanderLens in production
+# Run from the server/ directory with: gunicorn asgi:app
+# The app is async, so each uvicorn worker overlaps its Overpass/Vision/Translate
+# waits on one event loop instead of needing a thread per request
+
+bind = "127.0.0.1:5001"
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = 2
+timeout = 60
+keepalive = 5
@@ -516,47 +516,23 @@ async function getCurrentLocation() {
 }
 
 /**
- * Fetches nearby attractions from the backend
- * - Uses OpenStreetMap data through backend API
- * - Supports configurable search radius
- * - Includes distance and walking time calculations
+ * Fetches nearby attractions and food spots in a single backend call
+ * - Backend answers both from one OpenStreetMap query
+ * - Response carries the fields of both the /attractions and /food endpoints
  * 
  * @param {number} lat - Latitude of current location
  * @param {number} lon - Longitude of current location
  * @param {number} [radius=1000] - Search radius in meters (default 1km)
- * @returns {Promise<Object>} Attractions data including distances
+ * @returns {Promise<Object>} Attractions and food spots data including distances
  * @throws {Error} If backend request fails
  */
-async function fetchAttractions(lat, lon, radius = 1000) {
+async function fetchNearby(lat, lon, radius = 1000) {
   try {
-    const response = await fetch(`${BACKEND_URL}/attractions?lat=${lat}&lon=${lon}&radius=${radius}`);
+    const response = await fetch(`${BACKEND_URL}/nearby?lat=${lat}&lon=${lon}&radius=${radius}`);
     if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
     return await response.json();
   } catch (error) {
-    console.error('Error fetching attractions:', error);
-    throw error;
-  }
-}
-
-/**
- * Fetches nearby food spots from the backend
- * - Similar to fetchAttractions but for restaurants/cafes
- * - Uses same location and radius parameters
- * - Includes distance and estimated travel time
- * 
- * @param {number} lat - Latitude of current location
- * @param {number} lon - Longitude of current location
- * @param {number} [radius=1000] - Search radius in meters (default 1km)
- * @returns {Promise<Object>} Food spots data including distances
- * @throws {Error} If backend request fails
- */
-async function fetchFoodSpots(lat, lon, radius = 1000) {
-  try {
-    const response = await fetch(`${BACKEND_URL}/food?lat=${lat}&lon=${lon}&radius=${radius}`);
-    if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
-    return await response.json();
-  } catch (error) {
-    console.error('Error fetching food spots:', error);
+    console.error('Error fetching nearby places:', error);
     throw error;
   }
 }
@@ -859,7 +835,7 @@ document.addEventListener("DOMContentLoaded", () => {
         findAttractionsBtn.textContent = 'Finding Places...';
         attractionsList.innerHTML = '<p class="loading">Finding places near you...</p>';
         
-        // Fetch both attractions and food spots with timeouts
+        // Fetch attractions and food spots together, with a timeout
         const fetchWithTimeout = async (promise, name) => {
           const timeout = new Promise((_, reject) => 
             setTimeout(() => reject(new Error(`${name} request timed out`)), 20000)
@@ -867,28 +843,21 @@ document.addEventListener("DOMContentLoaded", () => {
           return Promise.race([promise, timeout]);
         };
 
-        const [attractionsData, foodData] = await Promise.all([
-          fetchWithTimeout(fetchAttractions(location.lat, location.lon)
-            .catch(error => {
-              console.error('Attractions fetch error:', error);
-              return { attractions: [], count: 0 };
-            }), 'Attractions'),
-          fetchWithTimeout(fetchFoodSpots(location.lat, location.lon)
-            .catch(error => {
-              console.error('Food spots fetch error:', error);
-              return { food_spots: [], food_count: 0 };
-            }), 'Food spots')
-        ]);
-
-        // Validate responses
-        if (!attractionsData || !foodData) {
+        const nearbyData = await fetchWithTimeout(fetchNearby(location.lat, location.lon)
+          .catch(error => {
+            console.error('Nearby places fetch error:', error);
+            return { attractions: [], count: 0, food_spots: [], food_count: 0 };
+          }), 'Nearby places');
+
+        // Validate response
+        if (!nearbyData) {
           throw new Error('Invalid response from server');
         }
 
         // Display attractions (default tab)
-        displayPlaces(attractionsData, 'attraction');
+        displayPlaces(nearbyData, 'attraction');
         // Pre-load food data
-        displayPlaces(foodData, 'food');
+        displayPlaces(nearbyData, 'food');
         
         // Show attractions tab by default
         attractionsTab.classList.add('active');